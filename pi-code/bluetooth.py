@@ -1,4 +1,8 @@
 import asyncio
+import contextlib
+import os
+import stat
+import sys
 from bleak import BleakScanner, BleakClient
 
 # The same UUIDs defined in the ESP32 code
@@ -6,14 +10,169 @@ SERVICE_UUID = "c7a72f3e-3151-4d39-a18e-4a73426b3e2b"
 CHAR_RX_UUID = "f3711319-333e-41a4-b04b-32a7b8e1136c" # ESP32 receives on this
 CHAR_TX_UUID = "d1aea128-4f7e-4c4f-a7b5-c603a111a00a" # ESP32 transmits on this
 
+# Requested BLE connection interval range, in units of 1.25 ms (7.5-15 ms).
+# The default 30-50 ms interval caps how quickly notifications can arrive.
+CONN_MIN_INTERVAL = 6
+CONN_MAX_INTERVAL = 12
+
+# Bluetooth adapter used for scanning and connecting. It is passed to bleak
+# explicitly so the connection interval below is set on the same adapter.
+HCI_ADAPTER = "hci0"
+
+# BlueZ reads the interval for new LE connections on an adapter from debugfs
+# (requires root)
+HCI_DEBUGFS_DIR = f"/sys/kernel/debug/bluetooth/{HCI_ADAPTER}"
+
+# Notifications received from the ESP32 that have not been printed yet
+rx_queue = asyncio.Queue()
+
+# Console input reader and its transport, set up on the first prompt. A None
+# reader means stdin cannot be watched by the event loop (e.g. a redirected
+# file) and input() runs in a worker thread instead.
+stdin_reader = None
+stdin_transport = None
+stdin_reader_ready = False
+
 def notification_handler(sender, data):
     """Handles incoming data from the ESP32."""
-    print(f"Received Notification: {data.decode()}")
+    # Only queue the data here so bleak can dispatch the next notification
+    # right away. Decoding and printing happen in print_notifications().
+    rx_queue.put_nowait(data)
+
+def write_notifications(notifications):
+    """Writes a batch of notifications to the console with a single flush."""
+    sys.stdout.write("".join(
+        f"Received Notification: {data.decode(errors='replace')}\n" for data in notifications
+    ))
+    sys.stdout.flush()
+
+def drain_notifications():
+    """Removes and returns every notification currently in the queue."""
+    notifications = []
+    while not rx_queue.empty():
+        notifications.append(rx_queue.get_nowait())
+    return notifications
+
+async def print_notifications():
+    """Prints notifications as they arrive, batching any that queue up."""
+    while True:
+        notifications = [await rx_queue.get()]
+        notifications.extend(drain_notifications())
+        write_notifications(notifications)
+
+async def open_stdin_reader():
+    """
+    Attaches an asyncio StreamReader to stdin if it is a terminal, pipe or
+    socket, and returns the reader and its transport. Regular files and
+    devices like /dev/null cannot be registered with the event loop, so
+    (None, None) is returned for those.
+    """
+    fd = sys.stdin.fileno()
+    mode = os.fstat(fd).st_mode
+    if os.isatty(fd):
+        # The transport makes its fd non-blocking. On a terminal, stdin,
+        # stdout and stderr usually share one open file description, so
+        # reading through stdin's fd would make stdout non-blocking too and
+        # let console writes fail with BlockingIOError. Opening the terminal
+        # again gives the reader a file description of its own.
+        reader_fd = os.open(os.ttyname(fd), os.O_RDONLY)
+    elif stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode):
+        # A duplicate, so closing the transport leaves fd 0 open
+        reader_fd = os.dup(fd)
+    else:
+        return None, None
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(reader_fd, 'rb', buffering=0))
+    return reader, transport
+
+def close_stdin_reader():
+    """
+    Closes the console input transport and puts stdin back in blocking mode,
+    so a pipe shared with other processes is left as it was found.
+    """
+    global stdin_reader, stdin_transport, stdin_reader_ready
+    if stdin_transport is not None:
+        # The transport closes itself when stdin reaches EOF
+        if not stdin_transport.is_closing():
+            stdin_transport.close()
+        # A pipe reader's fd is a duplicate of stdin's, so they share the
+        # non-blocking flag. A terminal reader has its own file description,
+        # so this leaves stdin unchanged there.
+        os.set_blocking(sys.stdin.fileno(), True)
+    stdin_reader = None
+    stdin_transport = None
+    stdin_reader_ready = False
+
+async def read_line(prompt):
+    """
+    Prompts for a line of console input without blocking the event loop.
+    Raises EOFError once stdin is closed, like input().
+    """
+    global stdin_reader, stdin_transport, stdin_reader_ready
+    if not stdin_reader_ready:
+        stdin_reader, stdin_transport = await open_stdin_reader()
+        stdin_reader_ready = True
+
+    if stdin_reader is None:
+        return await asyncio.to_thread(input, prompt)
+
+    print(prompt, end="", flush=True)
+    # The reader keeps any extra lines from a single read in its own buffer,
+    # so they are returned here without waiting on the fd again.
+    line = await stdin_reader.readline()
+    if not line:
+        raise EOFError
+    return line.decode(errors='replace').rstrip("\n")
+
+def write_connection_interval(min_interval, max_interval, min_first):
+    """Writes the adapter's default LE connection interval range to debugfs."""
+    # The kernel rejects a min above the current max (and a max below the
+    # current min), so the caller picks the order that keeps the range valid.
+    settings = [("conn_min_interval", min_interval), ("conn_max_interval", max_interval)]
+    if not min_first:
+        settings.reverse()
+    for name, value in settings:
+        with open(f"{HCI_DEBUGFS_DIR}/{name}", "w") as f:
+            f.write(str(value))
+
+@contextlib.contextmanager
+def fast_connection_interval():
+    """
+    Asks BlueZ to use a short connection interval for LE connections made
+    inside the block, then restores the adapter's previous defaults so other
+    programs' connections are not affected. Falls back to the adapter
+    defaults if debugfs is not writable.
+    """
+    saved = None
+    try:
+        with open(f"{HCI_DEBUGFS_DIR}/conn_min_interval") as f:
+            saved_min = int(f.read())
+        with open(f"{HCI_DEBUGFS_DIR}/conn_max_interval") as f:
+            saved_max = int(f.read())
+        saved = (saved_min, saved_max)
+        # Shrinking the range, so lower the min first
+        write_connection_interval(CONN_MIN_INTERVAL, CONN_MAX_INTERVAL, min_first=True)
+    except (OSError, ValueError) as e:
+        print(f"Could not set BLE connection interval, using adapter defaults. {e}")
+
+    try:
+        yield
+    finally:
+        if saved:
+            try:
+                # Growing the range back, so raise the max first
+                write_connection_interval(*saved, min_first=False)
+            except OSError as e:
+                print(f"Could not restore BLE connection interval. {e}")
 
 async def main():
     print("🔎 Scanning for devices...")
     device = await BleakScanner.find_device_by_filter(
-        lambda d, ad: SERVICE_UUID in ad.service_uuids
+        lambda d, ad: SERVICE_UUID in ad.service_uuids,
+        adapter=HCI_ADAPTER,
     )
 
     if not device:
@@ -22,7 +181,12 @@ async def main():
 
     print(f"✅ Found ESP32 BLE Server: {device.name} ({device.address})")
 
-    async with BleakClient(device) as client:
+    with fast_connection_interval():
+        await run_session(device)
+
+async def run_session(device):
+    """Connects to the ESP32 and relays messages until the user quits."""
+    async with BleakClient(device, adapter=HCI_ADAPTER) as client:
         if not client.is_connected:
             print("Failed to connect.")
             return
@@ -32,23 +196,29 @@ async def main():
         # Subscribe to notifications from the ESP32
         await client.start_notify(CHAR_TX_UUID, notification_handler)
         print("Subscribed to notifications. Waiting for data from ESP32...")
+        printer = asyncio.create_task(print_notifications())
         
         # Interactive loop to send data
-        while True:
-            try:
-                msg = await asyncio.to_thread(input, ">> Enter message to send (or 'quit'): ")
-                if msg.lower() == 'quit':
-                    break
-                
-                # Send data to the ESP32
-                await client.write_gatt_char(CHAR_RX_UUID, msg.encode())
-                print(f"Sent: {msg}")
+        try:
+            while True:
+                try:
+                    msg = await read_line(">> Enter message to send (or 'quit'): ")
+                    if msg.lower() == 'quit':
+                        break
+
+                    # Send data to the ESP32
+                    await client.write_gatt_char(CHAR_RX_UUID, msg.encode())
+                    print(f"Sent: {msg}")
 
-            except KeyboardInterrupt:
-                break
+                except (KeyboardInterrupt, EOFError):
+                    break
+        finally:
+            close_stdin_reader()
 
         # Unsubscribe before exiting
         await client.stop_notify(CHAR_TX_UUID)
+        printer.cancel()
+        write_notifications(drain_notifications())
 
 if __name__ == "__main__":
     try:
@@ -1,6 +1,8 @@
 import smbus2
+import ctypes
+import os
 import time
-import math
+import numpy as np
 
 # --- Configuration ---
 # I2C bus number. For Raspberry Pi 5, it's typically 1.
@@ -43,71 +45,154 @@ CHANNEL_MAP = {
     'D': 0b11
 }
 
+# Multi-Write command (0 1 0 0 0 DAC1 DAC0 UDAC). Each channel's two data
+# bytes are preceded by this command with the channel's CHANNEL_MAP bits in
+# DAC1:DAC0, so all four channels are updated in one transaction. Unlike
+# Sequential Write it does not program EEPROM, so it is safe to send at the
+# loop's update rate.
+MULTI_WRITE_COMMAND = 0b01000000
+
+# One channel's part of a Multi-Write frame: the command byte followed by
+# the two data bytes as a big-endian word (data_msb first).
+CHANNEL_FRAME_DTYPE = np.dtype([('command', 'u1'), ('data', '>u2')])
+
+# Number of samples in the precomputed sine wave period.
+LUT_SIZE = 4096
+
+# Time between DAC updates, in nanoseconds (1 ms).
+UPDATE_PERIOD_NS = 1_000_000
+
+# Linux clock ID for timerfd_create (see <time.h>).
+CLOCK_MONOTONIC = 1
+
+class timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+class itimerspec(ctypes.Structure):
+    _fields_ = [('it_interval', timespec), ('it_value', timespec)]
+
+def open_update_timer(period_ns):
+    """
+    Creates a Linux timerfd that expires every period_ns nanoseconds.
+    Reading 8 bytes from it blocks until the next expiration, which paces
+    the update loop more evenly than time.sleep().
+    """
+    libc = ctypes.CDLL(None, use_errno=True)
+    timer_fd = libc.timerfd_create(CLOCK_MONOTONIC, 0)
+    if timer_fd < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"timerfd_create failed: {os.strerror(errno)}")
+
+    period = timespec(period_ns // 1_000_000_000, period_ns % 1_000_000_000)
+    spec = itimerspec(it_interval=period, it_value=period)
+    if libc.timerfd_settime(timer_fd, 0, ctypes.byref(spec), None) != 0:
+        errno = ctypes.get_errno()
+        os.close(timer_fd)
+        raise OSError(errno, f"timerfd_settime failed: {os.strerror(errno)}")
+    return timer_fd
+
+def build_waveform_lut():
+    """
+    Precomputes one period of the sine wave as the two data bytes sent for
+    each sample, so the main loop only has to look up the current phase.
+    Returns a big-endian uint16 array indexed by phase, so each entry is
+    laid out in memory as data_msb followed by data_lsb.
+    """
+    # The wave oscillates between 0.0V and VDD.
+    amplitude = VDD / 2.0
+    offset = VDD / 2.0
+    v_ref = VDD if VREF_MODE == 0 else 2.048 * (2 if GAIN_MODE == 1 else 1)
+
+    phase = 2 * np.pi * np.arange(LUT_SIZE) / LUT_SIZE
+    # Clamp voltage to the valid range [0, v_ref]
+    voltage = np.clip(amplitude * np.sin(phase) + offset, 0, v_ref)
+    digital_values = (voltage / v_ref * 4095).astype(np.uint16)
+
+    data_msb = ((VREF_MODE & 0x01) << 7 |
+                (0 & 0x01) << 6 |  # Power Down bits (00 = normal operation)
+                (0 & 0x01) << 5 |
+                (GAIN_MODE & 0x01) << 4 |
+                ((digital_values >> 8) & 0x0F))
+    data_lsb = digital_values & 0xFF
+    return ((data_msb << 8) | data_lsb).astype('>u2')
+
 def main():
     """
     Main function to initialize I2C and run the voltage oscillation loop.
-    Uses a single "Sequential Write" command to update all four channels
+    Uses a single "Multi-Write" transaction to update all four channels
     at once for efficiency and reliability.
     """
     bus = None
+    timer_fd = None
     try:
         bus = smbus2.SMBus(I2C_BUS)
-        print("I2C bus opened. Starting DAC voltage oscillations using sequential writes.")
+        print("I2C bus opened. Starting DAC voltage oscillations using multi-writes.")
         print("Press Ctrl+C to stop.")
 
         # Print a one-time warning if the configuration might be confusing.
         if VREF_MODE == 0 and GAIN_MODE == 1:
             print("Warning: Gain is set to 2x but VDD is used as Vref. Gain will be treated as 1x by the DAC.")
 
+        waveform_lut = build_waveform_lut()
+
+        channel_order = ['A', 'B', 'C', 'D']
+        # LUT samples advanced per second for each channel.
+        phase_rates = np.array([CHANNEL_FREQUENCIES[channel] for channel in channel_order]) * LUT_SIZE
+
+        # Each channel's Multi-Write command and data bytes for every phase,
+        # one row per channel, flattened so row c starts at c * LUT_SIZE.
+        channel_frames = np.empty((len(channel_order), LUT_SIZE), dtype=CHANNEL_FRAME_DTYPE)
+        channel_frames['command'] = [[MULTI_WRITE_COMMAND | (CHANNEL_MAP[channel] << 1)]
+                                     for channel in channel_order]
+        channel_frames['data'] = waveform_lut
+        channel_offsets = np.arange(len(channel_order)) * LUT_SIZE
+        channel_frames = channel_frames.ravel()
+
+        # A single raw I2C write message reused for every update, so the
+        # payload is not re-marshaled into a new ctypes buffer each time.
+        # It holds a command byte and two data bytes for each channel.
+        frame_size = len(channel_order) * CHANNEL_FRAME_DTYPE.itemsize
+        write_msg = smbus2.i2c_msg.write(MCP4728_ADDRESS, bytes(frame_size))
+        write_buf = (ctypes.c_ubyte * frame_size).from_address(ctypes.addressof(write_msg.buf.contents))
+        frame = np.frombuffer(write_buf, dtype=CHANNEL_FRAME_DTYPE)
+
+        # When every channel runs at the same frequency, the whole frame
+        # depends only on the phase, so prebuild one frame per LUT sample
+        # and copy the current one into the message in a single call.
+        payload_table = None
+        if len(set(CHANNEL_FREQUENCIES.values())) == 1:
+            payload_table = np.ascontiguousarray(
+                channel_frames.reshape(len(channel_order), LUT_SIZE).T)
+            payload_table_address = payload_table.ctypes.data
+            write_buf_address = ctypes.addressof(write_buf)
+            shared_phase_rate = float(phase_rates[0])
+
+        timer_fd = open_update_timer(UPDATE_PERIOD_NS)
+
         start_time = time.time()
         first_run = True
 
         while True:
             elapsed_time = time.time() - start_time
 
-            # This command tells the MCP4728 to expect data for all four channels
-            # sequentially, starting from Channel A.
-            SEQ_WRITE_COMMAND = 0b01000000
-
-            i2c_payload = []
-            
-            # The order must be A, B, C, D for a sequential write.
-            channel_order = ['A', 'B', 'C', 'D']
-
-            for channel in channel_order:
-                frequency = CHANNEL_FREQUENCIES[channel]
-
-                # Calculate the target voltage using a sine wave.
-                # The wave oscillates between 0.0V and VDD.
-                amplitude = VDD / 2.0
-                offset = VDD / 2.0
-                voltage = amplitude * math.sin(2 * math.pi * frequency * elapsed_time) + offset
-
-                # --- Calculate Data Bytes for this Channel ---
-                v_ref = VDD if VREF_MODE == 0 else 2.048 * (2 if GAIN_MODE == 1 else 1)
-                
-                # Clamp voltage to the valid range [0, v_ref]
-                if voltage > v_ref: voltage = v_ref
-                if voltage < 0: voltage = 0
-                
-                digital_value = int((voltage / v_ref) * 4095)
-                
-                # Construct the two data bytes for this channel
-                data_msb = ((VREF_MODE & 0x01) << 7 |
-                            (0 & 0x01) << 6 |  # Power Down bits (00 = normal operation)
-                            (0 & 0x01) << 5 |
-                            (GAIN_MODE & 0x01) << 4 |
-                            ((digital_value >> 8) & 0x0F))
-                data_lsb = digital_value & 0xFF
-                
-                # Add the two bytes for this channel to our payload
-                i2c_payload.extend([data_msb, data_lsb])
+            if payload_table is not None:
+                phase_index = int(elapsed_time * shared_phase_rate) % LUT_SIZE
+                ctypes.memmove(write_buf_address,
+                               payload_table_address + phase_index * frame_size,
+                               frame_size)
+            else:
+                # Look up every channel's frame for its current phase at once,
+                # writing them straight into the message buffer.
+                phase_indices = (phase_rates * elapsed_time).astype(np.intp)
+                phase_indices %= LUT_SIZE
+                phase_indices += channel_offsets
+                np.take(channel_frames, phase_indices, out=frame)
 
             try:
-                # Write all 8 bytes (2 per channel) in a single I2C transaction
-                bus.write_i2c_block_data(MCP4728_ADDRESS, SEQ_WRITE_COMMAND, i2c_payload)
+                # Write all 4 channels in a single I2C transaction
+                bus.i2c_rdwr(write_msg)
                 if first_run:
-                    print("First sequential write successful. All channels are now oscillating.")
+                    print("First multi-write successful. All channels are now oscillating.")
                     first_run = False
             except IOError as e:
                 if first_run:
@@ -115,27 +200,32 @@ def main():
                     print("Please check connections and I2C configuration. The program will exit.")
                     break  # Exit the loop on the first error
                 # If not the first run, we can let it try again on the next loop.
-            
-            # A small delay to control the update rate and prevent 100% CPU usage.
-            time.sleep(0.001)
+
+            # Wait for the next timer expiration to control the update rate and
+            # prevent 100% CPU usage. If the loop ran late, this returns at once
+            # instead of queuing up the missed updates.
+            os.read(timer_fd, 8)
 
     except KeyboardInterrupt:
         print("\nProgram stopped by user. Closing I2C bus.")
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
     finally:
+        if timer_fd is not None:
+            os.close(timer_fd)
         if bus:
             # As a cleanup, set all channels to 0V before closing.
             print("Setting all DAC channels to 0V.")
             zero_volt_payload = []
-            for _ in range(4): # For each of the 4 channels
+            for channel_bits in CHANNEL_MAP.values(): # For each of the 4 channels
                 # MSB contains VREF and GAIN settings. LSB is all 0 for 0V.
                 data_msb = ((VREF_MODE & 0x01) << 7 | (GAIN_MODE & 0x01) << 4)
                 data_lsb = 0
-                zero_volt_payload.extend([data_msb, data_lsb])
+                zero_volt_payload.extend([MULTI_WRITE_COMMAND | (channel_bits << 1), data_msb, data_lsb])
             try:
-                SEQ_WRITE_COMMAND = 0b01000000
-                bus.write_i2c_block_data(MCP4728_ADDRESS, SEQ_WRITE_COMMAND, zero_volt_payload)
+                # The block write supplies Channel A's command byte, so it is
+                # dropped from the payload.
+                bus.write_i2c_block_data(MCP4728_ADDRESS, zero_volt_payload[0], zero_volt_payload[1:])
             except IOError:
                 print("Could not set DACs to 0V on exit. Device may be disconnected.")
             bus.close()
@@ -0,0 +1,30 @@
+/*
+ * Closest-point search for a single Kinect V2 depth frame.
+ *
+ * The frame size is fixed at compile time so the compiler can fully unroll
+ * and vectorize the loop. Built into the _min_nonzero module by
+ * build_min_nonzero.py.
+ */
+#include <float.h>
+#include <stddef.h>
+
+/* 512 x 424 depth pixels per frame */
+#define DEPTH_FRAME_SIZE 217088
+
+/* Returned when the frame has no valid (non-zero) pixels */
+static const float NO_VALID_DEPTH = FLT_MAX;
+
+/*
+ * Returns the smallest non-zero value in a depth frame of DEPTH_FRAME_SIZE
+ * floats, or NO_VALID_DEPTH if every pixel is 0.
+ */
+float min_nonzero(const float *depth)
+{
+    float m = NO_VALID_DEPTH;
+    for (size_t i = 0; i < DEPTH_FRAME_SIZE; i++) {
+        /* Written as two selects so the loop compiles to a vector min */
+        float v = depth[i] > 0.0f ? depth[i] : NO_VALID_DEPTH;
+        m = v < m ? v : m;
+    }
+    return m;
+}
@@ -5,7 +5,10 @@ import numpy as np
 # The path to your Point Cloud Data file
 file_name = 'output.pcd'
 # The point from which to measure the distance (x, y, z)
-origin_point = np.array([0, 0, 0])
+origin_point = np.array([0.0, 0.0, 0.0])
+# Edge length in meters of the voxel grid used to thin the cloud before the
+# search. The reported closest point is accurate to roughly this size.
+voxel_size = 0.02
 
 
 # --- Main Program ---
@@ -15,30 +18,34 @@ try:
     if not pcd.has_points():
         print(f"Error: The file {file_name} is empty or could not be read.")
     else:
-        # 2. Convert the points to a NumPy array
-        points = np.asarray(pcd.points)
-        print(f"Successfully loaded {len(points)} total points from {file_name}.")
-
-        # 3. Filter out non-finite points (nan, inf)
-        finite_mask = np.isfinite(points).all(axis=1)
-        points = points[finite_mask]
-        
-        if len(points) == 0:
+        print(f"Successfully loaded {len(pcd.points)} total points from {file_name}.")
+
+        # 2. Filter out non-finite points (nan, inf) in place, without
+        #    building a mask and a filtered copy of the points
+        pcd.remove_non_finite_points()
+
+        if not pcd.has_points():
             print("Error: After filtering, no valid (finite) points remain.")
         else:
-            print(f"Processing {len(points)} valid points after filtering.")
+            print(f"Processing {len(pcd.points)} valid points after filtering.")
 
-            # 4. Calculate the distance of each valid point from the origin
-            distances = np.linalg.norm(points - origin_point, axis=1)
+            # 3. Downsample to one point per voxel, then build a KD-tree over
+            #    the remaining points. Building it once lets any number of
+            #    origin queries run in O(log N) each.
+            valid_pcd = pcd.voxel_down_sample(voxel_size=voxel_size)
+            # A view of the downsampled points, not a copy
+            points = np.asarray(valid_pcd.points)
+            print(f"Searching {len(points)} points after {voxel_size} m voxel downsampling.")
+            kdtree = o3d.geometry.KDTreeFlann(valid_pcd)
 
-            # 5. Find the index of the point with the minimum distance
-            min_index = np.argmin(distances)
+            # 4. Find the index and squared distance of the nearest point
+            _, indices, squared_distances = kdtree.search_knn_vector_3d(origin_point, 1)
 
-            # 6. Get the coordinates and distance of the closest point
-            closest_point = points[min_index]
-            min_distance = distances[min_index]
+            # 5. Get the coordinates and distance of the closest point
+            closest_point = points[indices[0]]
+            min_distance = np.sqrt(squared_distances[0])
 
-            # 7. Print the results
+            # 6. Print the results
             print("-" * 30)
             print(f"Closest point to {origin_point} is: {closest_point}")
             print(f"Distance: {min_distance:.4f} meters")
@@ -11,6 +11,12 @@
 # How to run:
 # 1. Make sure the 'freenect2' and 'numpy' Python libraries are installed.
 #    pip install freenect2 numpy
+#    Optionally install 'numba' for a faster closest-point search.
+#    pip install numba
+#    There is also an opt-in C closest-point search (needs cffi and gcc).
+#    Build it with 'python build_min_nonzero.py' and set USE_C_MIN_NONZERO
+#    to True, but time it against the default search first: it is not
+#    faster on every CPU.
 # 2. Run the script from your terminal:
 #    python your_script_name.py
 #
@@ -19,9 +25,91 @@ from freenect2 import Device, FrameType
 import numpy as np
 import time
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Conversion factor from millimeters to inches
 MM_TO_INCHES = 0.0393701
 
+# Use the compiled C closest-point search built by build_min_nonzero.py
+USE_C_MIN_NONZERO = False
+
+_c_lib = None
+if USE_C_MIN_NONZERO:
+    try:
+        from _min_nonzero import ffi as _c_ffi, lib as _c_lib
+    except ImportError:
+        print("USE_C_MIN_NONZERO is set but _min_nonzero is not built, using the default search.")
+
+# Reused across frames, allocated on the first frame.
+_offset_bits = None
+
+def _min_nonzero_numpy(depth_data):
+    """
+    Returns the smallest non-zero value in the depth frame, or inf if the
+    frame has no valid pixels.
+
+    Positive float32 values sort the same way as their bit patterns read as
+    uint32. Subtracting 1 from the bits wraps 0 around to the largest uint32,
+    and negative values and NaN already sort above every positive value, so
+    a plain (vectorized) min over the shifted bits finds the smallest
+    positive depth without a mask or a compacted copy.
+    """
+    global _offset_bits
+    bits = np.asarray(depth_data, dtype=np.float32).view(np.uint32)
+    if _offset_bits is None or _offset_bits.shape != bits.shape:
+        _offset_bits = np.empty(bits.shape, dtype=np.uint32)
+    np.subtract(bits, 1, out=_offset_bits)
+    min_bits = int(_offset_bits.min())
+    if min_bits == 0xFFFFFFFF:
+        return np.inf
+    min_value = np.uint32(min_bits + 1).view(np.float32)
+    # Only negative or NaN pixels remain when no depth is positive
+    return min_value if min_value > 0 else np.inf
+
+if njit is not None:
+    # Full fastmath would assume there are no infinities, which breaks the
+    # inf starting value, so only allow reassociation for vectorizing.
+    @njit(parallel=True, fastmath={'reassoc'}, cache=True)
+    def _min_nonzero_kernel(flat):
+        # Numba splits the min reduction into per-thread partial results
+        # and combines them after the loop. Keeping the accumulator float32
+        # avoids widening every value to float64, which would halve the
+        # number of values each SIMD instruction compares.
+        inf = np.float32(np.inf)
+        m = inf
+        for i in prange(flat.size):
+            v = flat[i]
+            m = min(m, v if v > 0 else inf)
+        return m
+
+    def min_nonzero(depth_data):
+        """
+        Returns the smallest non-zero value in the depth frame, or inf if
+        the frame has no valid pixels, in a single pass over the frame.
+        """
+        return _min_nonzero_kernel(depth_data.ravel())
+else:
+    min_nonzero = _min_nonzero_numpy
+
+if _c_lib is not None:
+    _min_nonzero_generic = min_nonzero
+
+    def min_nonzero(depth_data):
+        """
+        Returns the smallest non-zero value in the depth frame, or inf if
+        the frame has no valid pixels. Full-size float32 Kinect frames go to
+        the compiled C loop, anything else to the generic search.
+        """
+        if (depth_data.size != _c_lib.DEPTH_FRAME_SIZE or
+                depth_data.dtype != np.float32 or
+                not depth_data.flags.c_contiguous):
+            return _min_nonzero_generic(depth_data)
+        min_value = _c_lib.min_nonzero(_c_ffi.cast('const float *', depth_data.ctypes.data))
+        return np.inf if min_value == _c_lib.NO_VALID_DEPTH else min_value
+
 def main():
     """
     Initializes the Kinect device and enters a loop to process depth frames.
@@ -51,17 +139,14 @@ def main():
                 # The data type is float32 and values are distances in millimeters.
                 depth_data = frame.to_array()
 
-                # Find all non-zero depth values. A value of 0 means the Kinect
-                # could not determine the depth for that pixel (e.g., too close,
-                # too far, or a material that absorbs infrared light).
-                non_zero_depths = depth_data[depth_data > 0]
-
-                if non_zero_depths.size > 0:
-                    # Find the minimum distance among all valid points
-                    min_depth_mm = np.min(non_zero_depths)
+                # Find the minimum non-zero depth value. A value of 0 means the
+                # Kinect could not determine the depth for that pixel (e.g., too
+                # close, too far, or a material that absorbs infrared light).
+                min_depth_mm = min_nonzero(depth_data)
 
+                if np.isfinite(min_depth_mm):
                     # Convert the distance to inches
-                    min_depth_inches = min_depth_mm * MM_TO_INCHES
+                    min_depth_inches = float(min_depth_mm) * MM_TO_INCHES
 
                     # --- 4. Print the result ---
                     # Print the distance to the console, overwriting the previous line.
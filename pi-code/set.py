@@ -1,16 +1,40 @@
-import board
-import adafruit_mcp4728
-import time
-
-i2c = board.I2C()
-mcp = adafruit_mcp4728.MCP4728(i2c)
-
-# Use normalized_value which is easier to work with (0.0 to 1.0)
-# This sets Channel A to its maximum voltage
-mcp.channel_a.normalized_value = 0.6
-mcp.channel_b.normalized_value = 0.4
-mcp.channel_c.normalized_value = 0.5
-mcp.channel_d.normalized_value = 0.5
+import smbus2
+
+# I2C bus number. For Raspberry Pi 5, it's typically 1.
+I2C_BUS = 1
+
+# I2C address of the MCP4728. Default is 0x60.
+MCP4728_ADDRESS = 0x60
+
+# VREF setting: 0 for VDD, 1 for internal 2.048V reference.
+VREF_MODE = 0  # 0 = VDD, 1 = Internal 2.048V
+
+# Gain setting: 0 for 1x, 1 for 2x.
+GAIN_MODE = 0 # 0 = 1x, 1 = 2x
+
+# Multi-Write command (0 1 0 0 0 DAC1 DAC0 UDAC). Each channel's two data
+# bytes are preceded by this command with the channel number in DAC1:DAC0,
+# so all four channels can be updated in one transaction. Unlike Sequential
+# Write it does not touch EEPROM.
+MULTI_WRITE_COMMAND = 0b01000000
+
+# Use normalized values which are easier to work with (0.0 to 1.0),
+# in channel order A, B, C, D.
+NORMALIZED_VALUES = [0.6, 0.4, 0.5, 0.5]
+
+i2c_payload = []
+for channel, normalized_value in enumerate(NORMALIZED_VALUES):
+    digital_value = int(round(normalized_value * 4095))
+    data_msb = ((VREF_MODE & 0x01) << 7 |
+                (GAIN_MODE & 0x01) << 4 |
+                ((digital_value >> 8) & 0x0F))
+    data_lsb = digital_value & 0xFF
+    i2c_payload.extend([MULTI_WRITE_COMMAND | (channel << 1), data_msb, data_lsb])
+
+# Write all 4 channels in a single I2C transaction. The block write supplies
+# Channel A's command byte, so it is dropped from the payload.
+with smbus2.SMBus(I2C_BUS) as bus:
+    bus.write_i2c_block_data(MCP4728_ADDRESS, i2c_payload[0], i2c_payload[1:])
 
 print("Channel A set to 2.5V voltage.")
 print("The script will now do nothing, check the voltage with a multimeter.")
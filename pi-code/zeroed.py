@@ -1,5 +1,5 @@
-import smbus2
-import time
+import fcntl
+import os
 
 # --- Configuration ---
 # I2C bus number. For Raspberry Pi 5, it's typically 1.
@@ -24,63 +24,101 @@ VREF_MODE = 0  # 0 = VDD, 1 = Internal 2.048V
 # Gain setting: 0 for 1x, 1 for 2x.
 GAIN_MODE = 0 # 0 = 1x, 1 = 2x
 
-def main():
+# Multi-Write command (0 1 0 0 0 DAC1 DAC0 UDAC). Each channel's two data
+# bytes are preceded by this command with the channel number in DAC1:DAC0.
+# It only updates the DAC registers, so it can be sent as often as needed.
+MULTI_WRITE_COMMAND = 0b01000000
+
+# Sequential Write command (0 1 0 1 0 DAC1 DAC0 UDAC) starting at Channel A.
+# The MCP4728 then takes two data bytes for each channel from A through D
+# and also stores them in EEPROM, which takes tens of milliseconds and wears
+# the EEPROM, so it is only used once to make 0V the power-on default.
+SEQ_WRITE_COMMAND = 0b01010000
+
+# ioctl request that selects the target device address (see <linux/i2c-dev.h>).
+I2C_SLAVE = 0x0703
+
+# --- Pre-encoded Zero Frames ---
+# For 0V, the digital value is always 0.
+_digital_value = 0
+
+# The two data bytes are the same for all channels.
+_data_msb = ((VREF_MODE & 0x01) << 7 |
+             (0 & 0x01) << 6 |  # Power Down bits (00 = normal operation)
+             (0 & 0x01) << 5 |
+             (GAIN_MODE & 0x01) << 4 |
+             ((_digital_value >> 8) & 0x0F))
+_data_lsb = _digital_value & 0xFF
+
+# A Multi-Write command byte and the data bytes for each of channels A, B,
+# C, D, encoded once so every call sends the same bytes object.
+ZERO_FRAME = bytes([byte
+                    for channel in range(4)
+                    for byte in (MULTI_WRITE_COMMAND | (channel << 1), _data_msb, _data_lsb)])
+
+# The Sequential Write command byte followed by the data bytes for channels
+# A, B, C, D, which also stores 0V in EEPROM.
+ZERO_EEPROM_FRAME = bytes([SEQ_WRITE_COMMAND] + [_data_msb, _data_lsb] * 4)
+
+# File descriptor for the I2C device, opened on first use and kept open.
+_i2c_fd = None
+
+def _write_frame(frame):
+    """Writes a frame to the DAC, opening the I2C device on first use."""
+    global _i2c_fd
+    if _i2c_fd is None:
+        fd = os.open(f"/dev/i2c-{I2C_BUS}", os.O_RDWR)
+        try:
+            fcntl.ioctl(fd, I2C_SLAVE, MCP4728_ADDRESS)
+        except OSError:
+            os.close(fd)
+            raise
+        _i2c_fd = fd
+    os.write(_i2c_fd, frame)
+
+def zero_dac():
     """
-    Main function to initialize I2C and set all four channels
-    to a static voltage of 0V using individual write commands.
+    Sets all four channels to 0V with a single write of the pre-encoded
+    frame. The I2C device is opened on the first call and reused after that,
+    so callers such as a watchdog can zero the DAC with one syscall. EEPROM
+    is not written, so this is safe to call repeatedly.
     """
-    bus = None
-    CHANNEL_MAP = {
-        'A': 0b00,
-        'B': 0b01,
-        'C': 0b10,
-        'D': 0b11
-    }
+    _write_frame(ZERO_FRAME)
 
-    try:
-        bus = smbus2.SMBus(I2C_BUS)
-        print(f"I2C bus opened. Setting all channels to {TARGET_VOLTAGE}V.")
-
-        # For 0V, the digital value is always 0.
-        digital_value = 0
-
-        # Construct the two data bytes once, as they are the same for all channels.
-        data_msb = ((VREF_MODE & 0x01) << 7 |
-                    (0 & 0x01) << 6 |  # Power Down bits (00 = normal operation)
-                    (0 & 0x01) << 5 |
-                    (GAIN_MODE & 0x01) << 4 |
-                    ((digital_value >> 8) & 0x0F))
-        data_lsb = digital_value & 0xFF
-        i2c_payload = [data_msb, data_lsb]
-
-        all_successful = True
-        for channel in ['A', 'B', 'C', 'D']:
-            try:
-                # The command byte is specific to each channel for a single write.
-                # Format: 01011(C1)(C0)0
-                command_byte = 0b01011000 | (CHANNEL_MAP[channel] << 1)
-
-                bus.write_i2c_block_data(MCP4728_ADDRESS, command_byte, i2c_payload)
-                print(f"Successfully set channel {channel} to 0V.")
-                time.sleep(0.1) # Small delay for stability
-
-            except IOError as e:
-                print(f"Error setting channel {channel}: Could not communicate with I2C device at 0x{MCP4728_ADDRESS:02X}. {e}")
-                print("Please check connections and I2C configuration.")
-                all_successful = False
-                break # Stop on first error
-
-        if all_successful:
-            print("\nFinished setting all channels to 0V.")
+def store_zero_default():
+    """
+    Stores 0V in the DAC's EEPROM as the power-on default for all four
+    channels. Each call uses up an EEPROM write cycle, so call it once.
+    """
+    _write_frame(ZERO_EEPROM_FRAME)
+
+def close():
+    """Closes the I2C device if zero_dac() or store_zero_default() opened it."""
+    global _i2c_fd
+    if _i2c_fd is not None:
+        os.close(_i2c_fd)
+        _i2c_fd = None
 
+def main():
+    """
+    Main function to set all four channels to a static voltage of 0V,
+    then store 0V as the power-on default.
+    """
+    try:
+        print(f"Setting all channels to {TARGET_VOLTAGE}V.")
+        zero_dac()
+        store_zero_default()
+        print("\nFinished setting all channels to 0V.")
+    except OSError as e:
+        print(f"Error: Could not communicate with I2C device at 0x{MCP4728_ADDRESS:02X}. {e}")
+        print("Please check connections and I2C configuration.")
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
     finally:
-        if bus:
-            bus.close()
+        if _i2c_fd is not None:
+            close()
             print("I2C bus closed.")
 
 
 if __name__ == "__main__":
     main()
-